@@ -1,12 +1,13 @@
 """Toolbox for Japanese text."""
 
 from ._version import __version__  # noqa: F401
-from .loader import load_aozorabunko
+from .loader import load_aozorabunko, load_aozorabunko_many
 from .textmodel import TextModel
 from .wordcloud import WordCloud
 
 __all__ = (
     "load_aozorabunko",
+    "load_aozorabunko_many",
     "TextModel",
     "WordCloud",
 )
@@ -0,0 +1,48 @@
+"""Persistent cache."""
+
+import functools
+import os
+from typing import Any
+
+
+def _get_cache_dir() -> str:
+    """
+    Return the per-user cache directory.
+
+    Returns
+    -------
+    str
+        ``$XDG_CACHE_HOME/shikaku``, or ``~/.cache/shikaku`` if
+        ``XDG_CACHE_HOME`` is not set.
+
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "shikaku")
+
+
+@functools.cache
+def get_cache() -> Any:
+    """
+    Return the on-disk cache shared among processes of the user.
+
+    Returns
+    -------
+    diskcache.Cache or None
+        Cache object, or None if `diskcache` is not installed or the cache
+        cannot be opened.
+
+    """
+    # Imported here, since importing diskcache is slow.
+    try:
+        import diskcache
+    except ImportError:  # pragma: no cover
+        return None
+
+    import sqlite3
+
+    try:
+        return diskcache.Cache(_get_cache_dir())
+    except (OSError, sqlite3.Error):
+        return None
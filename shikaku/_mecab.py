@@ -0,0 +1,34 @@
+"""MeCab taggers."""
+
+import functools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import MeCab
+
+
+@functools.cache
+def get_tagger(args: str = "") -> "MeCab.Tagger":
+    """
+    Return the shared MeCab tagger for the given options.
+
+    Parameters
+    ----------
+    args : str, default ""
+        Options for the tagger.
+
+    Returns
+    -------
+    MeCab.Tagger
+        Tagger.
+
+    Notes
+    -----
+    The tagger is created once and reused, because loading the dictionary is
+    expensive. The instance is not meant to be used concurrently from multiple
+    threads.
+
+    """
+    import MeCab
+
+    return MeCab.Tagger(args)
@@ -1,14 +1,34 @@
 """Text loaders."""
+import concurrent.futures
 import functools
+import gzip
 import io
 import re
+import time
+import urllib.error
 import urllib.request
 import warnings
 import zipfile
+from typing import Iterable, Optional
+
+from ._cache import get_cache
+
+_RUBY_ZIP_RE = re.compile(r"\d+_ruby_\d+\.zip")
+_TXT_ZIP_RE = re.compile(r"\d+_txt_\d+\.zip")
+_PIPE_RE = re.compile("｜")
+_RUBY_RE = re.compile("《.+?》")
+_STAFF_RE = re.compile("［＃.+?］")
+
+_ENCODING = "shift-jis"
+_HEADER_BYTES_RE = re.compile(rb"\-{5,}")
+_FOOTER_BYTES = "底本：".encode(_ENCODING)
+
+_DOWNLOAD_TRIES = 3
+_DOWNLOAD_RETRY_DELAY = 0.3
 
 
 @functools.cache
-def _download(url: str) -> bytes:
+def _download(url: str, *, persist: bool = False) -> bytes:
     """
     Return the file contents downloaded from the given URL.
 
@@ -16,15 +36,50 @@ def _download(url: str) -> bytes:
     ----------
     url : str
         URL for downloading data.
+    persist : bool, optional
+        Whether to keep the data in the on-disk cache. It should be used only
+        for URLs whose contents never change. Default is False.
 
     Returns
     -------
     bytes
         Downloaded data.
 
+    Notes
+    -----
+    With `persist`, downloaded data is also stored in the on-disk cache (if
+    available), which is shared among processes. Failed downloads are retried
+    a few times unless the server reports a client error. The data is
+    transferred with gzip compression if the server supports it.
+
     """
-    with urllib.request.urlopen(url) as f:  # noqa: S310
-        return f.read()  # type: ignore[no-any-return]
+    cache = get_cache() if persist else None
+    if cache is not None:
+        data = cache.get(url)
+        if data is not None:
+            return data  # type: ignore[no-any-return]
+
+    for i in range(_DOWNLOAD_TRIES):
+        try:
+            request = urllib.request.Request(  # noqa: S310
+                url, headers={"Accept-Encoding": "gzip"}
+            )
+            with urllib.request.urlopen(request) as f:  # noqa: S310
+                data = f.read()
+                if f.headers.get("Content-Encoding") == "gzip":
+                    data = gzip.decompress(data)
+            break
+        except urllib.error.URLError as e:
+            if isinstance(e, urllib.error.HTTPError) and e.code < 500:
+                raise
+            if i + 1 >= _DOWNLOAD_TRIES:
+                raise
+            time.sleep(_DOWNLOAD_RETRY_DELAY)
+
+    if cache is not None:
+        cache.set(url, data)
+
+    return data  # type: ignore[no-any-return]
 
 
 def _remove_annotations(text: str) -> str:
@@ -42,15 +97,84 @@ def _remove_annotations(text: str) -> str:
         Processed text.
 
     """
-    text = re.split(r"\-{5,}", text)[2]  # remove header
-    text = re.split("底本：", text)[0]  # remove footer
-    text = re.sub("｜", "", text)  # beginning of string with ruby
-    text = re.sub("《.+?》", "", text)  # ruby
-    text = re.sub("［＃.+?］", "", text)  # comments by staff
+    # Remove the header, which ends with the second line of dashes.
+    pos = 0
+    for _ in range(2):
+        pos = text.find("-----", pos)
+        if pos < 0:
+            raise AozoraBunkoFileError("header not found")
+        pos += 5
+        while pos < len(text) and text[pos] == "-":
+            pos += 1
+    text = text[pos:]
+
+    text = text.split("底本：", 1)[0]  # remove footer
+    return _remove_inline_annotations(text)
+
+
+def _remove_inline_annotations(text: str) -> str:
+    """
+    Remove ruby and comments in the text.
+
+    Parameters
+    ----------
+    text : str
+        Input text.
+
+    Returns
+    -------
+    str
+        Processed text.
+
+    """
+    text = _PIPE_RE.sub("", text)  # beginning of string with ruby
+    text = _RUBY_RE.sub("", text)  # ruby
+    text = _STAFF_RE.sub("", text)  # comments by staff
     text = text.strip()
     return text
 
 
+def _decode_body(data: bytes) -> Optional[str]:
+    """
+    Decode the body of the encoded text and remove annotations in it.
+
+    The header and footer are located in the raw bytes, so only the body is
+    decoded. This gives the same result as decoding the whole text and calling
+    `_remove_annotations`.
+
+    Parameters
+    ----------
+    data : bytes
+        Input text encoded in Shift_JIS.
+
+    Returns
+    -------
+    str or None
+        Processed text, or None if the body cannot be located reliably.
+
+    """
+    # "-" never appears in the trailing byte of a double-byte character.
+    m = _HEADER_BYTES_RE.search(data)
+    if not m:
+        return None
+    m = _HEADER_BYTES_RE.search(data, m.end())
+    if not m:
+        return None
+    start = m.end()
+
+    end = data.find(_FOOTER_BYTES, start)
+    if end < 0:
+        end = len(data)
+
+    try:
+        text = data[start:end].decode(_ENCODING)
+    except UnicodeDecodeError:
+        # Possibly a false match of the footer across character boundaries.
+        return None
+
+    return _remove_inline_annotations(text)
+
+
 class AozoraBunkoFileError(ValueError):
     """Error raised for unexpected format in files on Aozora Bunko."""
 
@@ -91,21 +215,23 @@ def load_aozorabunko(author_id: int, work_id: int, *, raw: bool = False) -> str:
     ).decode("utf-8")
 
     # Search for the ZIP file with ruby text from the library card.
-    m = re.search(r"\d+_ruby_\d+\.zip", card)
+    m = _RUBY_ZIP_RE.search(card)
     if not m:
         # Fallback to the ZIP file without ruby text.
-        m = re.search(r"\d+_txt_\d+\.zip", card)
+        m = _TXT_ZIP_RE.search(card)
         if not m:
             raise AozoraBunkoFileError(f"ZIP file not detected in {card_file}")
     zipname = m.group(0)
 
-    # Download the ZIP file.
+    # Download the ZIP file. Its name contains the revision, so it can be kept
+    # in the on-disk cache, unlike the library card.
     zipdata = zipfile.ZipFile(
         io.BytesIO(
             _download(
                 "https://raw.githubusercontent.com/"
                 "aozorabunko/aozorabunko/master/cards/"
-                f"{author_id:0=6}/files/{zipname}"
+                f"{author_id:0=6}/files/{zipname}",
+                persist=True,
             )
         )
     )
@@ -123,9 +249,51 @@ def load_aozorabunko(author_id: int, work_id: int, *, raw: bool = False) -> str:
     filename = text_filenames[0]
 
     # Extract text from the ZIP file.
-    text = zipdata.read(filename).decode("shift-jis")
-
     if not raw:
-        text = _remove_annotations(text)
+        data = zipdata.read(filename)
+        body = _decode_body(data)
+        if body is not None:
+            return body
+        return _remove_annotations(data.decode(_ENCODING))
 
-    return text
+    with zipdata.open(filename) as f, io.TextIOWrapper(
+        f, encoding=_ENCODING, newline=""
+    ) as g:
+        return g.read()
+
+
+def load_aozorabunko_many(
+    works: Iterable[tuple[int, int]],
+    *,
+    raw: bool = False,
+    max_workers: Optional[int] = None,
+) -> list[str]:
+    """
+    Return texts downloaded from Aozora Bunko (GitHub mirror) concurrently.
+
+    Parameters
+    ----------
+    works : iterable of (int, int)
+        Pairs of author IDs and work IDs.
+    raw : bool, default False
+        Whether it returns raw texts or not.
+    max_workers : int, optional
+        Maximum number of concurrent downloads.
+
+    Returns
+    -------
+    list[str]
+        Downloaded texts, in the same order as `works`.
+
+    Example
+    -------
+    >>> load_aozorabunko_many([(35, 1567), (148, 789)])  # doctest: +SKIP
+    ... # "Run, Melos!" and "I Am a Cat"
+
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                lambda work: load_aozorabunko(work[0], work[1], raw=raw), works
+            )
+        )
@@ -1,17 +1,131 @@
 """Markov chain model."""
 
+import functools
 import random
 import re
 import types
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 
-import igraph as ig
 import markovify
-import matplotlib.axes
-import matplotlib.pyplot as plt
-import MeCab
 from markovify.chain import BEGIN, END
 
+from ._mecab import get_tagger
+
+if TYPE_CHECKING:
+    import matplotlib.axes
+
+_BRACKETS = frozenset("「」（）")
+_SENTENCE_END_CHARS = frozenset("。！？!?")
+
+_INCOMPLETE_QUOTE_RE = re.compile(r"[^「」]*「[^「」]*」[^「」。！？!?]*[。！？!?]+\s*")
+_INCOMPLETE_TAIL_RE = re.compile("[^。！？!?]+$")
+
+
+def _strip_brackets(line: str) -> str:
+    """
+    Strip brackets and sentences with quotes from the line.
+
+    Parameters
+    ----------
+    line : str
+        Input line, without leading and trailing whitespace.
+
+    Returns
+    -------
+    str
+        Processed line.
+
+    """
+    while line:
+        if line[-1] == "」":
+            # "「...」" -> "..."
+            # "...「...」" -> "......"
+            i = line.rfind("「", 0, -1)
+            if (
+                i >= 0
+                and line.find("」", i + 1, -1) < 0
+                and (i == 0 or i + 2 < len(line))
+            ):
+                line = (line[:i] + line[i + 1 : -1]).strip()
+                continue
+        elif (
+            line[0] == "（"
+            and line[-1] == "）"
+            and line.find("（", 1, -1) < 0
+            and line.find("）", 1, -1) < 0
+        ):
+            # "（...）" -> "..."
+            line = line[1:-1].strip()
+            continue
+        break
+
+    # Remove possibly incomplete sentences,
+    # "...「...」...。..." -> "..."
+    # The matches are consumed from the left without copying the line.
+    pos = 0
+    while m := _INCOMPLETE_QUOTE_RE.match(line, pos):
+        pos = m.end()
+    return line[pos:]
+
+
+def _split_sentences(text: str) -> list[str]:
+    """
+    Split the text into sentences of space-separated words.
+
+    Parameters
+    ----------
+    text : str
+        Input text.
+
+    Returns
+    -------
+    list[str]
+        Sentences.
+
+    Notes
+    -----
+    A sentence ends with a run of "。", "！" and "？" (or "!" and "?") without
+    whitespace in between. "。" at the end of the run is dropped, while the
+    others are kept as words.
+
+    """
+    result = []
+    words: list[str] = []
+    ends: list[str] = []
+
+    def flush() -> None:
+        while ends and not ends[-1].rstrip("。"):
+            ends.pop()
+        if ends:
+            ends[-1] = ends[-1].rstrip("。")
+        words.extend(ends)
+        while words and words[-1].isspace():
+            words.pop()
+        if words:
+            result.append(" ".join(words))
+        words.clear()
+        ends.clear()
+
+    # Skip the BOS node; the loop stops before the EOS node, which is the only
+    # node without a successor. Thus all visited nodes have non-empty surfaces.
+    node = get_tagger("-Owakati").parseToNode(text).next
+    while node.next:
+        surface = node.surface
+        if _SENTENCE_END_CHARS.issuperset(surface):
+            if ends and node.rlength != node.length:
+                # Preceded by whitespace.
+                flush()
+            ends.append(surface)
+        else:
+            if ends:
+                flush()
+            if words or not surface.isspace():
+                words.append(surface)
+        node = node.next
+    flush()
+
+    return result
+
 
 def _preprocess_text(text: str) -> list[str]:
     """
@@ -28,8 +142,6 @@ def _preprocess_text(text: str) -> list[str]:
         Sentences.
 
     """
-    tagger = MeCab.Tagger("-Owakati")
-
     result = []
 
     for line in text.splitlines():
@@ -39,75 +151,45 @@ def _preprocess_text(text: str) -> list[str]:
             continue
 
         # Handle brackets.
-        if any(c in line for c in "「」（）"):
-            while True:
-                # "「...」" -> "..."
-                if (
-                    line[:1] == "「"
-                    and line[-1:] == "」"
-                    and "「" not in line[1:-1]
-                    and "」" not in line[1:-1]
-                ):
-                    line = line[1:-1].strip()
-                    continue
-                # "...「...」" -> "......"
-                line1 = re.sub("「([^「」]+)」$", r"\g<1>", line)
-                if line1 != line:
-                    line = line1.strip()
-                    continue
-                # "（...）" -> "..."
-                if (
-                    line[:1] == "（"
-                    and line[-1:] == "）"
-                    and "（" not in line[1:-1]
-                    and "）" not in line[1:-1]
-                ):
-                    line = line[1:-1].strip()
-                    continue
-                break
-            # Remove possibly incomplete sentences,
-            # "...「...」...。..." -> "..."
-            while True:
-                line1 = re.sub("^[^「」]*「[^「」]*」[^「」。！？!?]*[。！？!?]+", "", line)
-                if line1 != line:
-                    line = line1.strip()
-                    continue
-                break
+        if not _BRACKETS.isdisjoint(line):
+            line = _strip_brackets(line)
             # Check if brackets are still there.
             # It possibly contains incomplete sentences.
             # TODO: case of "「noun」".
-            if any(c in line for c in "「」（）"):
+            if not _BRACKETS.isdisjoint(line):
                 continue
 
         if not line:
             continue
 
         # Remove incomplete sentences.
-        line = re.sub("[^。！？!?]+$", "", line)
+        line = _INCOMPLETE_TAIL_RE.sub("", line, count=1)
 
         if not line:
             continue
 
-        line = re.sub("[。！？!?]+", r"\g<0>.", line)
-        line = re.sub(r"。+\.", ".", line)
-        line = tagger.parse(line).rstrip()
-        line = re.sub(r"\s+\.", ".", line)
-        result += line.split(".")
+        # Tokenize each line separately, so that it starts a new lattice: MeCab
+        # treats "\n" as whitespace and would otherwise segment the first word
+        # as a continuation of the previous line.
+        result += _split_sentences(line)
 
-    result = [x.strip() for x in result if x]
-    result = [x for x in result if x]
     return result
 
 
+@functools.lru_cache(maxsize=256)
+def _split_words(sentence: str) -> tuple[str, ...]:
+    # Cached, since repeated generation often starts with the same words.
+    tagger = get_tagger("-Owakati")
+    return tuple(tagger.parse(sentence.rstrip("。")).rstrip().split(" "))
+
+
 def _custom_word_split(self: "TextModel", sentence: str) -> list[str]:
-    tagger = MeCab.Tagger("-Owakati")
-    words = tagger.parse(sentence.rstrip("。")).rstrip().split(" ")
-    return words  # type: ignore[no-any-return]
+    return list(_split_words(sentence))
 
 
 def _custom_word_join(self: "TextModel", words: list[str]) -> str:
     sentence = "".join(words)
-    if sentence and sentence[-1] not in "。！？!?":
+    if sentence and sentence[-1] not in _SENTENCE_END_CHARS:
         sentence = sentence + "。"
     return sentence
 
@@ -223,7 +305,7 @@ class TextModel:
         dpi: Optional[int] = None,
         layout: Optional[str] = None,
         seed: Optional[int] = None,
-    ) -> matplotlib.axes.Axes:
+    ) -> "matplotlib.axes.Axes":
         """
         Plot the model.
 
@@ -246,6 +328,12 @@ class TextModel:
             Matplotlib axes containing the plot.
 
         """
+        # Plotting libraries are imported only when needed, as they are slow to
+        # import.
+        import igraph as ig
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         if self._model is None:
             raise ValueError("model is not yet trained")
 
@@ -263,48 +351,73 @@ class TextModel:
         ending_state = (END,)
 
         vertices: dict[tuple[str, ...], int] = {}
-        edges = []
-        weights = []
+        vertex_names: list[str] = []
+        edges: list[tuple[int, int]] = []
+        raw_weights: list[int] = []
 
         def get_state_name(state: tuple[str, ...]) -> str:
             if all(x == BEGIN for x in state):
                 return "BEGIN"
             if END in state:
                 return "END"
-            s = list(state)
-            while s[0] == BEGIN:
-                del s[0]
-            return ",".join(s)
-
-        def traverse(state: tuple[str, ...]) -> None:
-            if state in vertices:
-                return
-            vertices[state] = len(vertices)
+            i = 0
+            while state[i] == BEGIN:
+                i += 1
+            return ",".join(state[i:])
+
+        # Depth-first traversal with an explicit stack, which avoids hitting
+        # the recursion limit for large models.
+        stack: list[tuple[tuple[str, ...], Iterator[tuple[str, int]]]] = []
 
-            if state not in m:
-                return
+        def visit(state: tuple[str, ...]) -> None:
+            vertices[state] = len(vertices)
+            vertex_names.append(get_state_name(state))
+            stack.append((state, iter(m.get(state, {}).items())))
 
-            total_weight = sum(m[state].values())
+        visit(beginning_state)
 
-            for next_word, weight in m[state].items():
+        while stack:
+            state, transitions = stack[-1]
+            for next_word, weight in transitions:
                 if next_word == END:
                     next_state = ending_state
                 else:
                     next_state = state[1:] + (next_word,)  # type: ignore[assignment]
-                traverse(next_state)
+                is_new = next_state not in vertices
+                if is_new:
+                    visit(next_state)
                 edges.append((vertices[state], vertices[next_state]))
-                weights.append(weight / total_weight)
-
-        traverse(beginning_state)
+                raw_weights.append(weight)
+                if is_new:
+                    # Descend into the new state first.
+                    break
+            else:
+                stack.pop()
+
+        # Normalize the edge weights by the total weights of the source states.
+        # The totals are computed in one pass over the vertices, in the order
+        # of the vertex indices.
+        totals = np.fromiter(
+            (sum(m[x].values()) if x in m else 0 for x in vertices),
+            dtype=np.float64,
+            count=len(vertices),
+        )
+        sources = np.fromiter((x for x, _ in edges), dtype=np.intp, count=len(edges))
+        weights = np.asarray(raw_weights, dtype=np.float64) / totals[sources]
 
         _, ax = plt.subplots(figsize=(width, height), dpi=dpi)
 
-        g = ig.Graph(len(vertices), edges, directed=True)
+        g = ig.Graph(
+            n=len(vertex_names),
+            edges=edges,
+            directed=True,
+            vertex_attrs={"label": vertex_names},
+            edge_attrs={"weight": weights.tolist()},
+        )
         ig.plot(
             g,
             target=ax,
             layout=layout,
-            vertex_label=[get_state_name(x) for x in vertices],
             vertex_color="#f99",
             vertex_frame_color="#999",
             edge_label=[f"{x:.02f}" for x in weights],
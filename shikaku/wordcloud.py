@@ -1,19 +1,21 @@
 """Word cloud."""
 
+import functools
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-import matplotlib_fontja
-import MeCab
-import PIL.Image
-import wordcloud
+from ._mecab import get_tagger
+
+if TYPE_CHECKING:
+    import PIL.Image
+    import wordcloud
 
 
 @dataclass(frozen=True)
 class WordCloudResult:
     """Word cloud result."""
 
-    wordcloud: wordcloud.WordCloud
+    wordcloud: "wordcloud.WordCloud"
 
     def _repr_png_(self) -> Any:
         return self.wordcloud.to_image()._repr_png_()
@@ -30,7 +32,7 @@ class WordCloudResult:
         """
         self.wordcloud.to_file(filename)
 
-    def to_image(self) -> PIL.Image.Image:
+    def to_image(self) -> "PIL.Image.Image":
         """
         Return the PIL image of the word cloud.
 
@@ -42,19 +44,37 @@ class WordCloudResult:
         return self.wordcloud.to_image()  # type: ignore[no-any-return]
 
 
+# MeCab options to output the surface and the part of speech (the first two
+# fields of the feature) of each word per line, as "surface\tpos1,pos2".
+_TAGGER_ARGS = (
+    '-O "" "--node-format=%m\\t%f[0],%f[1]\\n" '
+    '"--unk-format=%m\\t%f[0],%f[1]\\n" --eos-format='
+)
+
+# Line endings in the MeCab output for common and proper nouns.
+_NOUN_LINE_SUFFIXES = ("\t名詞,普通名詞", "\t名詞,固有名詞")
+
+
 def _get_words(text: str) -> str:
     """Extract words suitable for word cloud."""
     words = []
-    tagger = MeCab.Tagger()
-    node = tagger.parseToNode(text)
-    while node:
-        a = node.feature.split(",")
-        if a[0] == "名詞" and (a[1] == "普通名詞" or a[1] == "固有名詞"):
-            words.append(node.surface)
-        node = node.next
+    tagger = get_tagger(_TAGGER_ARGS)
+    # Split only on "\n": surfaces may contain other line breaks, e.g., "\r".
+    for line in tagger.parse(text).split("\n"):
+        # Other lines, the vast majority, are rejected without any split.
+        if line.endswith(_NOUN_LINE_SUFFIXES):
+            words.append(line.partition("\t")[0])
     return " ".join(words)
 
 
+@functools.cache
+def _get_font_path() -> str:
+    """Return the path to the Japanese font, which is looked up only once."""
+    import matplotlib_fontja
+
+    return matplotlib_fontja.get_font_ttf_path()  # type: ignore[no-any-return]
+
+
 class WordCloud:
     """Word cloud."""
 
@@ -82,9 +102,12 @@ class WordCloud:
         self._background_color = background_color
         self._words: Optional[str] = None
 
-    def _create(self, seed: Optional[int]) -> wordcloud.WordCloud:
+    def _create(self, seed: Optional[int]) -> "wordcloud.WordCloud":
+        # This library is imported only when needed, as it is slow to import.
+        import wordcloud
+
         return wordcloud.WordCloud(
-            font_path=matplotlib_fontja.get_font_ttf_path(),
+            font_path=_get_font_path(),
             width=self._width,
             height=self._height,
             background_color=self._background_color,
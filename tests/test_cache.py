@@ -0,0 +1,31 @@
+import pathlib
+from typing import Iterator
+
+import pytest
+
+import shikaku._cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> Iterator[None]:
+    shikaku._cache.get_cache.cache_clear()
+    yield
+    shikaku._cache.get_cache.cache_clear()
+
+
+def test_get_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    pytest.importorskip("diskcache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    cache = shikaku._cache.get_cache()
+    assert cache is not None
+    assert pathlib.Path(cache.directory) == tmp_path / "shikaku"
+
+
+def test_get_cache_unavailable(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    # The cache directory cannot be created under a regular file.
+    not_a_dir = tmp_path / "file"
+    not_a_dir.touch()
+    monkeypatch.setenv("XDG_CACHE_HOME", str(not_a_dir))
+    assert shikaku._cache.get_cache() is None
@@ -1,3 +1,15 @@
+import email.message
+import gzip
+import io
+import re
+import urllib.error
+import urllib.request
+import urllib.response
+import zipfile
+from typing import Optional
+
+import pytest
+
 import shikaku.loader
 
 
@@ -17,3 +29,104 @@ def test_remove_annotations() -> None:
 """
     s2 = """今日は昨日の明日です。"""
     assert shikaku.loader._remove_annotations(s1) == s2
+
+
+def test_download_retry(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def urlopen(request: urllib.request.Request) -> urllib.response.addinfourl:
+        calls.append(request.full_url)
+        if len(calls) < 2:
+            raise urllib.error.URLError("temporary failure")
+        return urllib.response.addinfourl(
+            io.BytesIO(b"data"), email.message.Message(), request.full_url
+        )
+
+    monkeypatch.setattr(shikaku.loader, "_DOWNLOAD_RETRY_DELAY", 0)
+    monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+
+    url = "https://example.com/test_download_retry"
+    assert shikaku.loader._download(url) == b"data"
+    assert calls == [url, url]
+
+
+@pytest.mark.parametrize("encoding", [None, "gzip"])
+def test_download_gzip(
+    monkeypatch: pytest.MonkeyPatch, encoding: Optional[str]
+) -> None:
+    def urlopen(request: urllib.request.Request) -> urllib.response.addinfourl:
+        assert request.get_header("Accept-encoding") == "gzip"
+        headers = email.message.Message()
+        data = b"data"
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+            data = gzip.compress(data)
+        return urllib.response.addinfourl(io.BytesIO(data), headers, request.full_url)
+
+    monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+
+    url = f"https://example.com/test_download_gzip/{encoding}"
+    assert shikaku.loader._download(url) == b"data"
+
+
+def test_download_persist(monkeypatch: pytest.MonkeyPatch) -> None:
+    class Cache(dict[str, bytes]):
+        def set(self, key: str, value: bytes) -> None:  # noqa: A003
+            self[key] = value
+
+    cache = Cache()
+
+    def urlopen(request: urllib.request.Request) -> urllib.response.addinfourl:
+        return urllib.response.addinfourl(
+            io.BytesIO(b"data"), email.message.Message(), request.full_url
+        )
+
+    monkeypatch.setattr(shikaku.loader, "get_cache", lambda: cache)
+    monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+
+    url1 = "https://example.com/test_download_persist/card.html"
+    url2 = "https://example.com/test_download_persist/1_ruby_2.zip"
+    assert shikaku.loader._download(url1) == b"data"
+    assert shikaku.loader._download(url2, persist=True) == b"data"
+    assert cache == {url2: b"data"}
+
+
+def test_load_aozorabunko_many(monkeypatch: pytest.MonkeyPatch) -> None:
+    def download(url: str, *, persist: bool = False) -> bytes:
+        m = re.search(r"/0*(\d+)/card(\d+)\.html$", url)
+        if m:
+            return f'<a href="./files/{m[1]}{m[2]}_ruby_1.zip">'.encode()
+        m = re.search(r"/files/(\d+)_ruby_1\.zip$", url)
+        assert m
+        f = io.BytesIO()
+        with zipfile.ZipFile(f, "w") as z:
+            text = f"題名\r\n-----\r\n\r\n-----\r\n本文{m[1]}。\r\n底本：\r\n"
+            z.writestr(f"{m[1]}.txt", text.encode("shift-jis"))
+        return f.getvalue()
+
+    monkeypatch.setattr(shikaku.loader, "_download", download)
+
+    assert shikaku.loader.load_aozorabunko_many([(1, 2), (3, 4), (5, 6)]) == [
+        "本文12。",
+        "本文34。",
+        "本文56。",
+    ]
+
+
+@pytest.mark.parametrize(
+    "s",
+    [
+        "題名\r\n-----\r\n注\r\n-----\r\n［＃３字下げ］｜明日《あした》。\r\n底本：書名\r\n",
+        "題名\r\n-----\r\n注\r\n-------\r\n本文\r\n",
+    ],
+)
+def test_decode_body(s: str) -> None:
+    data = s.encode("shift-jis")
+    assert shikaku.loader._decode_body(data) == shikaku.loader._remove_annotations(s)
+
+
+def test_decode_body_without_header() -> None:
+    s = "題名\r\n-----\r\n本文\r\n"
+    assert shikaku.loader._decode_body(s.encode("shift-jis")) is None
+    with pytest.raises(shikaku.loader.AozoraBunkoFileError):
+        shikaku.loader._remove_annotations(s)
@@ -1,3 +1,5 @@
+import pytest
+
 import shikaku.textmodel
 
 
@@ -10,6 +12,9 @@ def test_preprocess_text() -> None:
 「山だ。」と言った。「谷だ。」
 「川だ。」と言った。
 （狼だ。）
+円周率は3.14です。
+しかし雨だ。
+ええと晴れだ。
 「カレーは
 飲み物」。
 猿だ
@@ -20,6 +25,9 @@ def test_preprocess_text() -> None:
 猫 だ ？
 谷 だ
 狼 だ
+円周 率 は 3 . 14 です
+しかし 雨 だ
+ええと 晴れ だ
 """.strip().splitlines()
     assert shikaku.textmodel._preprocess_text(s) == r
 
@@ -30,3 +38,20 @@ def test_generate() -> None:
     assert model.generate() == "これはペンです。"
     assert model.generate(beginning="これ") == "これはペンです。"
     assert model.generate(beginning="これは") == "これはペンです。"
+
+
+def test_plot() -> None:
+    matplotlib = pytest.importorskip("matplotlib")
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib.text
+
+    model = shikaku.textmodel.TextModel(state_size=1)
+    model.fit("吾輩は猫である。名前はまだない。猫は名前である。")
+    ax = model.plot()
+    labels = sorted(t.get_text() for t in ax.findobj(matplotlib.text.Text))
+    plt.close("all")
+
+    vertex_labels = "BEGIN END ある で ない は まだ 名前 吾輩 猫".split()
+    edge_labels = ["0.33"] * 6 + ["0.50"] * 4 + ["1.00"] * 5
+    assert [x for x in labels if x] == edge_labels + vertex_labels
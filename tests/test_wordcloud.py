@@ -3,3 +3,4 @@ import shikaku.wordcloud
 
 def test_get_words() -> None:
     assert shikaku.wordcloud._get_words("すもももももももものうち") == "すもも もも もも うち"
+    assert shikaku.wordcloud._get_words("猫です。\r\n東京です。\r\n") == "猫 東京"